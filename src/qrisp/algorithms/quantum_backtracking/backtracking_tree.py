@@ -16,8 +16,6 @@
 ********************************************************************************/
 """
 
-from itertools import product
-
 import numpy as np
 import networkx as nx
 from sympy.physics.quantum import Ket, OrthogonalKet
@@ -658,10 +656,6 @@ class QuantumBacktrackingTree:
 
         
         
-        # Prepare control state specificator
-        ctrl_state = ""
-        mcz_list = []
-
         # D_x operates on the space span(|x>, {|y>, x->y})
         # In order to make sure our mcz gate only marks |x>, we can use the
         # oddity of h, because if h(x) is odd, then h(y) is not.
@@ -675,18 +669,13 @@ class QuantumBacktrackingTree:
                 cx(self.h[i], oddity_qbl)
                 
 
-        ctrl_state += "1"
-        mcz_list.append(oddity_qbl)
-
         # Determine accept value
         accept_value = self.accept()
-        mcz_list.append(accept_value)
-        ctrl_state += "0"
 
-
-    	# Add additional control qubits
-        mcz_list += ctrl
-        ctrl_state += "1"*len(ctrl)
+        # Prepare the control qubits and the control state specificator
+        # (oddity, accept value and additional control qubits)
+        mcz_list = [oddity_qbl, accept_value] + list(ctrl)
+        ctrl_state = "10" + "1"*len(ctrl)
         
         # Perform mcz gate
         mcz(mcz_list, ctrl_state=ctrl_state)
@@ -729,23 +718,16 @@ class QuantumBacktrackingTree:
         
         # Determine reject value
         reject_value = self.reject_function(self)
-        mcz_list = [reject_value]
-        ctrl_state = "1"
 
         # Make sure we only apply the phase to the child states (parent states
-        # have oddity 1)
-        mcz_list.append(oddity_qbl)
-        ctrl_state += "0"
+        # have oddity 1) and add the extra controls
+        mcz_list = [reject_value, oddity_qbl] + list(ctrl)
+        ctrl_state = "10" + "1"*len(ctrl)
 
         # Check if |x> is root. Otherwise, if the reject funtions returns "True" on the lift of the root a wrong phase (-1) may be applied to the root.
         # mcz_list.append(is_root)
         # ctrl_state += "0"
         
-
-        # Add extra controls
-        mcz_list += ctrl
-        ctrl_state += "1"*len(ctrl)
-        
         #Perform MCZ gate
         mcz(mcz_list, ctrl_state = ctrl_state)
         
@@ -824,15 +806,28 @@ class QuantumBacktrackingTree:
         else:
             height_tracker = -1
             
+        # The controlled quantum steps of the different QPE iterations only differ
+        # in the control qubit. If the IterationEnvironment is compiled on exit
+        # (i.e. it is not nested in another QuantumEnvironment), we therefore only
+        # construct and precompile the first step and replay the compiled content
+        # on the other control qubits.
+        step_env = None
+
         for i in range(qpe_res.size):
-            
+
             if height_tracker >= 0 and False:
                 for j in range(2**i):
                     self.quantum_step(ctrl=[qpe_res[i]], min_height_assumption = height_tracker)
                     height_tracker -= 2
-            else:
-                with IterationEnvironment(self.qs, 2**i, precompile=True):
+            elif step_env is None:
+                iter_env = IterationEnvironment(self.qs, 2**i, precompile=True)
+                with iter_env:
                     self.quantum_step(ctrl=[qpe_res[i]])
+                
+                if iter_env.compiled_data is not None:
+                    step_env = iter_env
+            else:
+                step_env.replay(2**i, [qpe_res[0]], [qpe_res[i]])
 
         QFT(qpe_res, inv=True)
 
@@ -901,10 +896,28 @@ class QuantumBacktrackingTree:
 
         self.h[:] = h_state
 
-        for i in range(1, len(path)+1):
-            with self.h == self.max_depth - i:
-                for j in range(i):
-                    self.branch_qa[-j-1].encode(path[j], permit_dirtyness=True)
+        self._encode_phi_path(path)
+
+    def _encode_phi_path(self, path, branch_offset = 0):
+        # Encodes the branches of the path for the node states of the phi state.
+        # branch_offset is the amount of branch qubits (counted from the root)
+        # that are already occupied, i.e. the length of the root path for subtrees.
+
+        # The j-th branch of the path needs to be encoded on every node of the path
+        # with h <= max_depth - j - 1. Since h is one-hot encoded, we can compute
+        # this condition by adding the qubits of h into a QuantumBool one by one.
+        # This way we only need a single controlled encoding per branch.
+        depth_indicator = QuantumBool()
+
+        for j in range(len(path))[::-1]:
+            cx(self.h[self.max_depth - j - 1], depth_indicator)
+            with control(depth_indicator):
+                self.branch_qa[-branch_offset-j-1].encode(path[j], permit_dirtyness=True)
+
+        for j in range(len(path)):
+            cx(self.h[self.max_depth - j - 1], depth_indicator)
+
+        depth_indicator.delete()
 
     def init_node(self, path):
         """
@@ -1194,27 +1207,32 @@ class QuantumBacktrackingTree:
 
         last_layer = [root]
 
+        # Decode the branch labels once instead of for every node
+        branch_labels = [self.branch_qa[0].decoder(j) for j in range(2**self.branch_qa[0].size)]
 
         for i in range(self.max_depth):
 
             next_layer = []
+            layer_edges = []
 
             for parent_node in last_layer:
 
-                for j in range(2**self.branch_qa[0].size):
+                for branch_label in branch_labels:
 
-                    child_node_path = list(parent_node.path) + [self.branch_qa[0].decoder(j)]
+                    child_node_path = list(parent_node.path) + [branch_label]
 
                     child_node = QBTNode(self, child_node_path)
 
                     child_node.amplitude = sv_function(child_node.sv_specifier())
 
-                    res_graph.add_node(child_node)
-                    res_graph.add_edge(parent_node, child_node,
-                                       label=child_node_path[-1])
+                    layer_edges.append((parent_node, child_node, {"label" : branch_label}))
 
                     next_layer.append(child_node)
 
+            # Add the nodes and edges of the whole layer at once
+            res_graph.add_nodes_from(next_layer)
+            res_graph.add_edges_from(layer_edges)
+
             last_layer = next_layer
 
         if return_root:
@@ -1276,64 +1294,69 @@ class QuantumBacktrackingTree:
 
         G, root = self.statevector_graph(return_root = True)
 
-        def tree_layout(G, node, depth, theta_parent, res_dic={}):
+        def tree_layout(G, root):
+
+            res_dic = {root : (0, 0)}
+
+            # Precompute the angle parameters of each layer
+            layer_angles = 2*np.pi/self.degree**np.arange(self.max_depth+2)
+
+            # Traverse the tree with an explicit stack of (node, depth, theta_parent)
+            stack = [(root, 0, 0)]
+
+            while stack:
+
+                node, depth, theta_parent = stack.pop()
 
-            r = depth + 1
-            delta_theta = 2*np.pi/self.degree**(depth+1)
-            theta_start = theta_parent - 2*np.pi/self.degree**(depth)/4
+                r = depth + 1
+                delta_theta = layer_angles[depth+1]
+                theta_start = theta_parent - layer_angles[depth]/4
 
-            children = list(G.neighbors(node))
+                children = list(G.neighbors(node))
 
-            for i in range(len(children)):
+                for i in range(len(children)):
 
-                theta = theta_start + i*delta_theta
+                    theta = theta_start + i*delta_theta
 
-                res_dic[children[i]] = (r*np.sin(theta), r*np.cos(theta))
+                    res_dic[children[i]] = (r*np.sin(theta), r*np.cos(theta))
 
-                tree_layout(G, children[i], depth+1, theta, res_dic)
+                    stack.append((children[i], depth+1, theta))
 
             return res_dic
 
 
-        pos= tree_layout(G, root, 0, 0)
-        pos[root]= (0, 0)
+        pos = tree_layout(G, root)
 
-        import colorsys
-        def complex_to_color(cnumber):
+        from matplotlib.colors import hsv_to_rgb
+        from scipy.special import expit
 
+        # Computes the colors of an array of amplitudes in a vectorized manner
+        def complex_to_colors(amplitudes):
 
-            angle = np.angle(cnumber)
-            radius = np.abs(cnumber)
+            angles = np.angle(amplitudes)
+            radii = np.abs(amplitudes)
 
             # Normalize the angle to the range [0, 2*pi)
-            angle= (angle + np.pi*5/2) % (2 * np.pi)
+            angles = (angles + np.pi*5/2) % (2 * np.pi)
 
             # Map the angle to the hue component of the color
-            hue = angle / (2*np.pi)
+            hues = angles / (2*np.pi)
 
             # Map the radius to the saturation and value components of the color
-            saturation = 1
-            value = 1
+            saturations = np.ones(len(hues))
+            values = np.ones(len(hues))
 
             # Convert the HSV components to RGB
-            hsv_color = (hue, saturation, value)
-            rgb_color = colorsys.hsv_to_rgb(*hsv_color)
+            rgb_colors = hsv_to_rgb(np.stack([hues, saturations, values], axis = -1))
 
-            from scipy.special import expit
-
-            intensity = expit((radius-0.2)*10)
+            intensities = expit((radii-0.2)*10)
 
+            rgb_colors = (rgb_colors * 255 * intensities[:, None]).astype(int)
 
             # Convert the RGB components to hexadecimal format
-            hex_color = '#{:02x}{:02x}{:02x}'.format(
-                int(rgb_color[0] * 255*intensity),
-                int(rgb_color[1] * 255*intensity),
-                int(rgb_color[2] * 255*intensity)
-            )
-
-            return hex_color
+            return ['#{:02x}{:02x}{:02x}'.format(*rgb_color) for rgb_color in rgb_colors]
 
-        colors = [complex_to_color(node.amplitude) for node in G.nodes()]
+        colors = complex_to_colors(np.array([node.amplitude for node in G.nodes()]))
 
         nx.draw(G, pos)
         nx.draw_networkx_nodes(G, pos, node_color=colors)
@@ -1422,100 +1445,86 @@ class QuantumBacktrackingTree:
 
         """
 
-        sv_function = self.qs.statevector("function", decimals = 10)
+        from qrisp.simulator import statevector_sim
+
+        if len(self.qs.env_stack):
+            raise Exception("Tried to evaluate statevector within open QuantumEnvironments")
 
         # Internal qvs are the quantum variables that specify a backtrackingtree node
         # internal_qvs = [self.h, self.branch_workspace] + list(self.branch_qa)
         internal_qvs = [self.h] + list(self.branch_qa)
         # External qvs are any quantum variables that are also registered in the QuantumSession
         # but don't specify a node
-        external_qvs = list(self.qs.qv_list)
-
-        # Remove the internal qvs from the external qv_list
-        for qv in internal_qvs:
-            for i in range(len(external_qvs)):
-                if hash(external_qvs[i]) == hash(qv):
-                    external_qvs.pop(i)
-                    break
-
-        # Get a list of possible labels for each qv
-
-        internal_qv_labels = []
-        for qv in internal_qvs:
-            label_list = []
-            for i in range(2**qv.size):
-                label_list.append(qv.decoder(i))
-            internal_qv_labels.append(label_list)
-
-        external_qv_labels = []
-        for qv in external_qvs:
-            label_list = []
-            for i in range(2**qv.size):
-                label_list.append(qv.decoder(i))
-            external_qv_labels.append(label_list)
-
-        # This retrieves a list of all possible constellations of labels
-        internal_label_product = list(product(*internal_qv_labels))
-        external_label_product = list(product(*external_qv_labels))
+        # Note that we can't put the QuantumVariables themselves into a set,
+        # since QuantumVariable.__eq__ performs a quantum comparison.
+        internal_hashes = set(hash(qv) for qv in internal_qvs)
+        external_qvs = [qv for qv in self.qs.qv_list if hash(qv) not in internal_hashes]
+
+        # Simulate the statevector
+        compiled_qc = self.qs.compile()
+        sv_array = np.round(statevector_sim(compiled_qc), 10)
+
+        n = len(compiled_qc.qubits)
+        qubit_positions = {qb: i for i, qb in enumerate(compiled_qc.qubits)}
+
+        # Qubits that don't belong to any QuantumVariable (like clean ancillae)
+        # are considered to be in the |0> state
+        free_qubit_mask = 0
+        for qb in set(compiled_qc.qubits) - set(sum([list(qv) for qv in self.qs.qv_list], [])):
+            free_qubit_mask |= 1 << (n - 1 - qubit_positions[qb])
+
+        # Instead of evaluating the amplitude of every possible label constellation,
+        # we only go through the basis states with non-vanishing amplitude.
+        # If there are no external qvs, the amplitudes are rounded to 5 decimals
+        # before they are compared to the cutoff.
+        if len(external_qvs) == 0:
+            sv_array = np.round(sv_array, 5)
+
+        state_indices = np.nonzero(np.abs(sv_array) >= 1E-5)[0]
+        state_indices = state_indices[(state_indices & free_qubit_mask) == 0]
+
+        # This array contains the bits of these basis states. Column i belongs
+        # to compiled_qc.qubits[i]
+        bit_array = (state_indices[:, None] >> np.arange(n)[::-1]) & 1
+
+        # Get a list of the labels of each qv for each basis state.
+        # The decoder only needs to be called once per appearing outcome.
+        def get_labels(qv):
+            positions = [qubit_positions[qb] for qb in qv]
+            label_ints = bit_array[:, positions] @ (1 << np.arange(qv.size))
+            unique_ints, inverse = np.unique(label_ints, return_inverse = True)
+            decoder_table = [qv.decoder(int(i)) for i in unique_ints]
+            return [decoder_table[i] for i in inverse.ravel()]
+
+        internal_qv_labels = [get_labels(qv) for qv in internal_qvs]
+        external_qv_labels = [get_labels(qv) for qv in external_qvs]
 
         # This will be the sympy object that is returned
         res_state = 0
 
-        # Go through all internal label consteallations (ie. node states)
-        for internal_label_const in internal_label_product[::-1]:
+        for k in range(len(state_indices)):
 
-            # print(internal_label_const)
-            # Get the path to that node state
-            path = self.path_decoder(internal_label_const[0], internal_label_const[1:])
-            # print(path)
+            amplitude = sv_array[state_indices[k]]
 
+            # Get the path to the node state
+            path = self.path_decoder(internal_qv_labels[0][k], [labels[k] for labels in internal_qv_labels[1:]])
 
-            # Create a label dic for the sv_function
-            internal_label_dic= {internal_qvs[i]: internal_label_const[i] for i in range(len(internal_qvs))}
-
-            # If there are no external qvs, we can simply call the sv_function
-            # with the label dic
+            # If there are no external qvs, we can simply add the corresponding ket
             if len(external_qvs) == 0:
 
-                amplitude = sv_function(internal_label_dic, 5)
-
-                if abs(amplitude) < 1E-5:
-                    continue
-
-                # print(res_state)
-                # Add the corresponding ket
-                res_state += np.round(amplitude, 5) * OrthogonalKet(str(path))
+                res_state += amplitude * OrthogonalKet(str(path))
 
-                # print(res_state)
-
-
-            # If there are external qvs we do a similar procedure to go through
-            # all label constellations
+            # If there are external qvs, we also generate the ket expression
+            # for the external qvs
             else:
 
-                for external_label_const in external_label_product:
-
-
-                    # Set up the external label dic
-                    external_label_dic= {external_qvs[i]: external_label_const[i] for i in range(len(external_qvs))}
-
-                    # Integrate the internal label dic
-                    external_label_dic.update(internal_label_dic)
-
-                    # Retrieve the amplitude
-                    amplitude = sv_function(external_label_dic)
+                external_ket_expr = 1
+                for labels in external_qv_labels:
+                    external_ket_expr *= OrthogonalKet(labels[k])
 
-                    if abs(amplitude) < 1E-5:
-                        continue
-
-                    external_ket_expr = 1
-                    # Generate the ket expression for the external qvs
-                    for label in external_label_const:
-                        external_ket_expr *= OrthogonalKet(label)
-
-                    # Add the corresponding state
-                    res_state += amplitude * \
-                        OrthogonalKet(str(path)) * external_ket_expr
+                # Add the corresponding state
+                res_state += amplitude * \
+                    OrthogonalKet(str(path)) * external_ket_expr
 
         return res_state
 
@@ -1774,20 +1783,15 @@ class Subtree(QuantumBacktrackingTree):
 
         self.h[:] = h_state
 
-        rev_branch_qa = self.branch_qa[::-1]
-
-        with self.h == self.max_depth:
-            for k in range(len(self.root_path)):
-                rev_branch_qa[k][:] = self.root_path[k]
+        # Every node of the path shares the root path of the subtree,
+        # so we can encode it without any control
 
-        for i in range(1, len(path)+1):
-            with self.h == self.max_depth - i:
-                for j in range(i):
-                    rev_branch_qa[j].encode(
-                        path[j], permit_dirtyness=True)
+        if len(self.root_path):
+            self.branch_qa[-len(self.root_path):] = self.root_path[::-1]
 
-                for k in range(len(self.root_path)):
-                    rev_branch_qa[k+i][:] = self.root_path[k]
+        # The remaining branches are encoded as in QuantumBacktrackingTree.init_phi
+        # with an offset given by the length of the root path.
+        self._encode_phi_path(path, len(self.root_path))
 
     def subtree(self, path):
         return self.original_tree.subtree(path)
@@ -1803,15 +1807,24 @@ def find_solution(tree, precision, cl_accept=None, traversed_nodes=None, measure
     # If there is no classical accept function given, we create a copy of the original
     # tree and evaluate the quantum accept function on that node via the simulator
     if cl_accept is None:
+        
+        if isinstance(tree, Subtree):
+            original_tree = tree.original_tree
+        else:
+            original_tree = tree
+        
+        # The copied tree can't be reused, since init_node requires fresh qubits.
+        # We therefore cache the results to evaluate the simulator at most once per path.
+        accept_results = {}
+        
         def cl_accept(path):
-            if isinstance(tree, Subtree):
-                copied_tree = tree.original_tree.copy()
-            else:
-                copied_tree = tree.copy()
-            copied_tree.init_node(path)
-            accept_qbl = copied_tree.accept()
-            mes_res = accept_qbl.get_measurement()
-            return mes_res == {True: 1}
+            if tuple(path) not in accept_results:
+                copied_tree = original_tree.copy()
+                copied_tree.init_node(path)
+                accept_qbl = copied_tree.accept()
+                mes_res = accept_qbl.get_measurement()
+                accept_results[tuple(path)] = mes_res == {True: 1}
+            return accept_results[tuple(path)]
 
 
     # The first step is to check wether the current root is a solution
@@ -1825,9 +1838,9 @@ def find_solution(tree, precision, cl_accept=None, traversed_nodes=None, measure
     elif tree.max_depth == 0:
         return None
 
-    # This list keeps track of which nodes have already been checked for solutions
+    # This set keeps track of which nodes have already been checked for solutions
     if traversed_nodes is None:
-        traversed_nodes = []
+        traversed_nodes = set()
 
     # Initialize the root node
     tree.init_node([])
@@ -1896,7 +1909,7 @@ def find_solution(tree, precision, cl_accept=None, traversed_nodes=None, measure
         if solution is not None:
             break
         else:
-            traversed_nodes.append(tuple(new_path))
+            traversed_nodes.add(tuple(new_path))
 
     else:
         raise Exception(
@@ -1914,9 +1927,15 @@ class QBTNode:
         self.path=path
         self.tree=tree
         self.amplitude=amplitude
+        self.hash_value=hash(tuple(path))
 
     def __hash__(self):
-        return hash(str(self.path))
+        return self.hash_value
+
+    def __eq__(self, other):
+        if not isinstance(other, QBTNode):
+            return False
+        return self.tree is other.tree and list(self.path) == list(other.path)
 
     def sv_specifier(self):
         amplitude_state_specifyer={
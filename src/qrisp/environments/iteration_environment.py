@@ -138,6 +138,11 @@ class IterationEnvironment(QuantumEnvironment):
         # In this case we enable manual allocation management because the compilation
         # function is simple enough that we can ignore the allocation logic.
         self.manual_allocation_management = True
+        
+        # These attributes are set once the environment is compiled and allow
+        # repeating the compiled content via the replay method.
+        self.compiled_data = None
+        self.workspace_qubits = []
 
     def __enter__(self):
 
@@ -220,42 +225,89 @@ class IterationEnvironment(QuantumEnvironment):
             # create a new ancilla variable to hold these qubits
             
             # Determine the workspace qubits from the compiled qc
-            workspace_qubits = list(
+            self.workspace_qubits = list(
                 set(compiled_qc.qubits) - set(anc_qv.reg))
             
-            if len(workspace_qubits):
-                # Allocate a QuantumVariable that will hold the workspace
-                workspace_var = QuantumVariable(
-                    len(workspace_qubits), qs=self.env_qs, name="workspace_var*")
-            else:
-                workspace_var = []
-
-            # We now prepare the qubit lists for the retarget_instructions function
-
-            source_qubits = workspace_qubits
-            target_qubits = list(workspace_var)
-
-            # Perform instruction retargeting
-            retarget_instructions(compiled_data, source_qubits, target_qubits)
-
+            self.compiled_data = compiled_data
+            
             # Perform iterated instruction execution
-            for i in range(self.iteration_amount):
-                compiled_data = [instr.copy() for instr in compiled_data]
-                self.env_qs.data.extend(compiled_data)
-
-            # Delete workspace variable
-            if isinstance(workspace_var, QuantumVariable):
-                workspace_var.delete()
+            self.replay(self.iteration_amount)
 
         # The non-precompiled case is much simpler
         else:
 
             QuantumEnvironment.compile(self)
 
-            compiled_data = list(self.env_qs.data)
+            self.compiled_data = list(self.env_qs.data)
 
             self.env_qs.data = temp_qs_data
 
-            for i in range(self.iteration_amount):
-                compiled_data = [instr.copy() for instr in compiled_data]
-                self.env_qs.data.extend(compiled_data)
+            self.replay(self.iteration_amount)
+
+    def replay(self, iteration_amount, source_qubits=[], target_qubits=[]):
+        """
+        Appends the compiled content of this IterationEnvironment another
+        ``iteration_amount`` times to the QuantumSession, where the qubits in
+        ``source_qubits`` are replaced by the corresponding qubits in
+        ``target_qubits``.
+        
+        This allows repeating the same circuit on different qubits without
+        constructing and (pre)compiling it again. Note that this is only possible
+        once the environment has been compiled, i.e. after it has been exited
+        outside of any other QuantumEnvironment.
+
+        Parameters
+        ----------
+        iteration_amount : integer
+            The amount of iterations to append.
+        source_qubits : list[Qubit], optional
+            The qubits to replace. The default is [].
+        target_qubits : list[Qubit], optional
+            The qubits to replace ``source_qubits`` with. The default is [].
+
+        Examples
+        --------
+        
+        We increment a second QuantumFloat using the compiled content:
+        
+        >>> from qrisp import QuantumFloat, IterationEnvironment
+        >>> a = QuantumFloat(3)
+        >>> b = QuantumFloat(3, qs = a.qs)
+        >>> iter_env = IterationEnvironment(a.qs, iteration_amount = 2)
+        >>> with iter_env:
+        ...     a += 1
+        >>> iter_env.replay(3, a.reg, b.reg)
+        >>> print(b)
+        {3: 1.0}
+
+        """
+        
+        if self.compiled_data is None:
+            raise Exception("Tried to replay IterationEnvironment which has not been compiled")
+        
+        compiled_data = [instr.copy() for instr in self.compiled_data]
+        
+        # The workspace qubits of the precompilation result need to be hosted
+        # by a newly allocated QuantumVariable
+        if len(self.workspace_qubits):
+            # Allocate a QuantumVariable that will hold the workspace
+            workspace_var = QuantumVariable(
+                len(self.workspace_qubits), qs=self.env_qs, name="workspace_var*")
+        else:
+            workspace_var = []
+
+        # We now prepare the qubit lists for the retarget_instructions function
+        source_qubits = self.workspace_qubits + list(source_qubits)
+        target_qubits = list(workspace_var) + list(target_qubits)
+
+        # Perform instruction retargeting
+        retarget_instructions(compiled_data, source_qubits, target_qubits)
+
+        # Perform iterated instruction execution
+        for i in range(iteration_amount):
+            compiled_data = [instr.copy() for instr in compiled_data]
+            self.env_qs.data.extend(compiled_data)
+
+        # Delete workspace variable
+        if isinstance(workspace_var, QuantumVariable):
+            workspace_var.delete()
@@ -27,6 +27,11 @@ class VirtualBackend(BackendClient):
     Python thread. This structure allows setting up convenient wrappers for foreign/
     modified circuit dispatching code.
 
+    Since client and server share the same Python process, circuits submitted
+    via ``virtual_backend_instance.run(qc)`` are handed to ``run_func`` directly
+    instead of being sent through the HTTP interface of the server. The server
+    is still started, so other clients can connect to it on the given port.
+
     Circuits can be run using ``virtual_backend_instance.run(qc)``.
     The function that should be used to run a circuit can be specified during
     construction using the ``run_func`` parameter.
@@ -119,7 +124,29 @@ class VirtualBackend(BackendClient):
             A dictionary containing the measurement results.
 
         """
-        return super().run(qc, shots)
+        # The server runs in this process, so there is no need to deploy the
+        # circuit and poll for the job via HTTP - we can call run_func right away.
+        return self.backend_server.run_func(qc.qasm(), shots, token)
+
+    def run_batch(self, qc_list, shots, token=""):
+        """
+        Executes the function run_func specified at object creation on each
+        QuantumCircuit of a list.
+
+        Parameters
+        ----------
+        qc_list : list[QuantumCircuit]
+            The QuantumCircuits to run.
+        shots : int
+            The amount of shots to perform for each circuit.
+
+        Returns
+        -------
+        res : list[dict]
+            A list containing the measurement results of each circuit.
+
+        """
+        return [self.run(qc, shots, token) for qc in qc_list]
 
 
 class VirtualQiskitBackend(VirtualBackend):
@@ -77,19 +77,42 @@ class BackendClient:
         
     #Executes 
     def run(self, qc, shots):
-        qasm_str = qc.qasm()
+        return self.run_batch([qc], shots)[0]
+    
+    def run_batch(self, qc_list, shots):
+        """
+        Executes multiple QuantumCircuits within a single deployment and job.
+        Compared to calling ``run`` for each circuit, this saves the HTTP round
+        trips for deploying, submitting and polling every circuit individually.
+
+        Parameters
+        ----------
+        qc_list : list[QuantumCircuit]
+            The QuantumCircuits to run.
+        shots : int
+            The amount of shots to perform for each circuit.
+
+        Returns
+        -------
+        results : list[dict]
+            A list containing the measurement results of each circuit (in the
+            order of ``qc_list``).
+
+        """
+        
+        programs = []
+        for qc in qc_list:
+            programs.append({
+                            "quantumCircuit": qc.qasm(),
+                            "assemblerLanguage": "QASM2",
+                            "pythonFilePath": "",
+                            "pythonFileMetadata": ""
+                            })
         
         deployment_data = {
-                        "programs": [
-                                {
-                                    "quantumCircuit": qasm_str,
-                                    "assemblerLanguage": "QASM2",
-                                    "pythonFilePath": "",
-                                    "pythonFileMetadata": ""
-                                    }
-                                    ],
-                                "name": ""
-                            }
+                        "programs": programs,
+                        "name": ""
+                        }
         deployment_response = requests.post(f'{self.api_endpoint}/deployments', json = deployment_data, verify = False)
 
         if deployment_response.status_code == 422:
@@ -136,6 +159,7 @@ class BackendClient:
             time.sleep(0.1)
             
         
-        results = job_get_response.json()["results"][0]["results"]
+        results = [res["results"] for res in job_get_response.json()["results"]
+                   if res.get("resultType", "COUNTS") == "COUNTS"]
         
         return results
@@ -1195,6 +1195,10 @@ def get_statevector_function(qs, decimals=None):
         if decimals is not None:
             sv_array = np.round(sv_array, decimals)
 
+        # Determine the position of each qubit once, such that each call of the
+        # returned function doesn't have to search the qubit list of compiled_qc
+        qubit_positions = {qb: i for i, qb in enumerate(compiled_qc.qubits)}
+
         def statevector(label_constellation, round=None):
             from qrisp import bin_rep
 
@@ -1218,7 +1222,7 @@ def get_statevector_function(qs, decimals=None):
                 bin_label_int = bin_rep(label_int, qf.size)[::-1]
 
                 for i in range(qf.size):
-                    qubit_pos = compiled_qc.qubits.index(qf[i])
+                    qubit_pos = qubit_positions[qf[i]]
                     bitstring[qubit_pos] = bin_label_int[i]
 
             bitstring = "".join(bitstring)
@@ -95,6 +95,19 @@ def test_backtracking():
     
     assert mes_res[0] > 0.375
     
+    # Test phase estimation within another QuantumEnvironment
+    from qrisp import QuantumEnvironment
+    
+    tree = QuantumBacktrackingTree(3, QuantumFloat(1, name = "branch_qf*"), P, Q)
+    tree.init_node([])
+    
+    with QuantumEnvironment():
+        res = tree.estimate_phase(3)
+    
+    mes_res = res.get_measurement()
+    
+    assert mes_res[0] > 0.375
+    
     for i in range(1,5):
     
         tree = QuantumBacktrackingTree(i, QuantumFloat(1, name = "branch_qf*"), P, Q)
@@ -166,3 +179,16 @@ def test_backtracking():
     mes_res = qpe_res.get_measurement()
     
     assert mes_res[0] < 0.25
+    
+    # Test phi state initialization of subtrees
+    
+    tree = QuantumBacktrackingTree(3, QuantumFloat(1, name = "branch_qf*"), accept, reject)
+    subtree = tree.subtree([1])
+    subtree.init_phi([0,1])
+    
+    mes_res = multi_measurement([subtree.h, subtree.branch_qa])
+    
+    mes_res = {(k[0], tuple(k[1])) : v for k, v in mes_res.items()}
+    
+    assert set(mes_res.keys()) == {(2, (0,0,1)), (1, (0,0,1)), (0, (1,0,1))}
+    assert abs(mes_res[(2, (0,0,1))] - 0.5) < 1E-4
@@ -79,6 +79,14 @@ def test_qiskit_backend_client():
 
     assert str(test_virtual_backend.run(qc, 100)) == "{'0': 100}"
     assert test_virtual_backend.run(qc, 100)["0"] == 100
+    
+    assert test_virtual_backend.run_batch([qc, qc], 100) == [{"0": 100}, {"0": 100}]
+    
+    # Batched execution through the HTTP interface of the server
+    from qrisp.interface import BackendClient
+    test_client = BackendClient(api_endpoint="localhost", port=test_virtual_backend.port)
+    assert test_client.run_batch([qc, qc, qc], 100) == 3*[{"0": 100}]
+    assert test_client.run(qc, 100) == {"0": 100}
 
     ###################
 